@@ -1,11 +1,13 @@
 from __future__ import annotations
-from typing import cast, List, Tuple, TypeVar, Generic, Optional
+from typing import cast, List, Tuple, TypeVar, Generic, Optional, Iterator, NamedTuple, Callable
 from dataclasses import dataclass
-from itertools import product, permutations
+from itertools import product, compress
 from copy import deepcopy
 from prettytable import PrettyTable
 from PIL import Image, ImageDraw, ImageFont
 from argparse import ArgumentParser
+from functools import lru_cache, partial
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import re, os
 
 
@@ -14,8 +16,8 @@ import re, os
 ###############
 
 # Class containing file and rank offset
-@dataclass
-class Offset:
+# Offsets are plain tuples, so they can be unpacked in hot loops
+class Offset(NamedTuple):
     file: int
     rank: int
 
@@ -30,6 +32,11 @@ class Square:
     # ID of direction from which square is reachable (optional)
     directionId: int = -1
 
+    # Index of square in SQUARES and bitboards
+    @property
+    def index(self) -> int:
+        return self.file << 3 | self.rank
+
     # Test whether square is on 8x8 chessboard
     def onBoard(self) -> bool:
         return 0 <= self.file <= 7 and 0 <= self.rank <= 7
@@ -40,7 +47,7 @@ class Square:
 
     # Get square name as string
     def __str__(self) -> str:
-        return fileToStr(self.file) + rankToStr(self.rank)
+        return SQUARE_NAMES[self.index]
 
     # Return new square with added offset
     def __add__(self, offset: Offset):
@@ -56,38 +63,61 @@ class Square:
             return False
         return self.file == other.file and self.rank == other.rank
 
+    # Hash is consistent with equality
+    def __hash__(self) -> int:
+        return self.index
+
 # Generic variable
 T = TypeVar("T")
 
 # Class for storing a value for every square of an 8x8 chessboard
 class Board(Generic[T]):
 
-    # 2D array for storing values
-    board: list[list[T]]
+    # Flat array for storing values, indexed by 8 * file + rank
+    board: list[T]
 
     # Create board with initial value for every square
+    # Immutable values can be shared by all squares
     def __init__(self, initial: T) -> None:
-        self.board = [[deepcopy(initial) for _ in range(8)] for _ in range(8)]
+        if isinstance(initial, (bool, int, str, type(None))):
+            self.board = [initial] * 64
+        else:
+            self.board = [deepcopy(initial) for _ in range(64)]
+
+    # Create board with a new value from factory for every square
+    # Cheaper than copying an initial value for mutable values
+    @classmethod
+    def fromFactory(cls, factory: Callable[[], T]) -> Board[T]:
+        board: Board[T] = cls.__new__(cls)
+        board.board = [factory() for _ in range(64)]
+        return board
 
     # Get value of square
     def __getitem__(self, square: Square) -> T:
-        return self.board[square.file][square.rank]
+        return self.board[square.index]
 
     # Set value of square
     def __setitem__(self, square: Square, value: T) -> None:
-        self.board[square.file][square.rank] = value
+        self.board[square.index] = value
+
+    # Return shallow copy of board (values themselves are shared)
+    def copy(self) -> Board[T]:
+        board: Board[T] = Board.__new__(Board)
+        board.board = self.board[:]
+        return board
 
 # Statistics for one square of one piece
 class Stats:
 
     # Move groups by disambiguation type
+    # Flags are stored as bytes (square flags in order of SQUARES)
     plainMove: bool
-    fileMove: list[bool]
-    rankMove: list[bool]
-    squareMove: Board[bool]
+    fileMove: bytearray
+    rankMove: bytearray
+    squareMove: bytearray
 
     # Reachable squares
-    reachable: Board[bool]
+    reachable: bytearray
 
     # Move groups by what moves they are missing
     missingMoves: dict[str, list[tuple[str, str]]]
@@ -98,10 +128,10 @@ class Stats:
     def __init__(self) -> None:
 
         self.plainMove    = False
-        self.fileMove     = [False] * 8
-        self.rankMove     = [False] * 8
-        self.squareMove   = Board(False)
-        self.reachable    = Board(False)
+        self.fileMove     = bytearray(8)
+        self.rankMove     = bytearray(8)
+        self.squareMove   = bytearray(64)
+        self.reachable    = bytearray(64)
         self.missingMoves = {"checkmate": [], "check": [], "both": []}
         self.finalSymbol  = [0] * 3
 
@@ -115,24 +145,57 @@ resultType = Tuple[List[Tuple[str, str]], Board[Stats]]
 
 # List of all square
 SQUARES = [Square(file, rank) for file in range(8) for rank in range(8)]
+# Names of all files, ranks, and squares (in order of SQUARES)
+FILE_NAMES   = "abcdefgh"
+RANK_NAMES   = "12345678"
+SQUARE_NAMES = [fileName + rankName for fileName in FILE_NAMES for rankName in RANK_NAMES]
 # Possible promotion pieces
 PROMOTION = ["R", "B", "Q", "N"]
 # Possible final symbols (nothing, check, checkmate)
 FINAL_SYMBOL = ["", "+", "#"]
 
 # Jump offsets for pieces
-PAWN_JUMPS        = [Offset(1, 1), Offset(-1, 1)]
-KING_JUMPS        = [Offset(file, rank) for (file, rank) in product([1, 0, -1], repeat=2) if (file, rank) != (0, 0)]
-KNIGHT_JUMPS      = [Offset(value[0] * sign[0], value[1] * sign[1])
-    for value in permutations([1, 2]) for sign in product([1, -1], repeat=2)]
+PAWN_JUMPS        = (Offset(1, 1), Offset(-1, 1))
+KING_JUMPS        = (Offset(1, 1), Offset(1, 0), Offset(1, -1), Offset(0, 1),
+                     Offset(0, -1), Offset(-1, 1), Offset(-1, 0), Offset(-1, -1))
+KNIGHT_JUMPS      = (Offset(1, 2), Offset(1, -2), Offset(-1, 2), Offset(-1, -2),
+                     Offset(2, 1), Offset(2, -1), Offset(-2, 1), Offset(-2, -1))
 
 # Direction offsets for pieces
-ROOK_DIRECTIONS   = [Offset(1, 0), Offset(-1, 0), Offset(0, 1), Offset(0, -1)]
-BISHOP_DIRECTIONS = [Offset(file, rank) for (file, rank) in product([1, -1], repeat=2)]
+ROOK_DIRECTIONS   = (Offset(1, 0), Offset(-1, 0), Offset(0, 1), Offset(0, -1))
+BISHOP_DIRECTIONS = (Offset(1, 1), Offset(1, -1), Offset(-1, 1), Offset(-1, -1))
 QUEEN_DIRECTIONS  = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
 
+# Square indices of every rank in FEN order for every combination of flipped files and ranks
+FEN_RANKS = {
+    (flipFiles, flipRanks): tuple(
+        tuple(file << 3 | rank for file in (range(8) if not flipFiles else range(7, -1, -1)))
+        for rank in (range(7, -1, -1) if not flipRanks else range(8))
+    )
+    for flipFiles in [False, True] for flipRanks in [False, True]
+}
+# Runs of empty squares written as "1" and their FEN representation, longest first
+FEN_EMPTY_RUNS = [("1" * length, str(length)) for length in range(8, 1, -1)]
+
+# Translation tables for flipping files [a-h] to [h-a] and ranks [1-8] to [8-1], indexed by (flipFiles, flipRanks)
+FLIP_TABLES = {
+    (flipFiles, flipRanks): str.maketrans(
+        ("abcdefgh" if flipFiles else "") + ("12345678" if flipRanks else ""),
+        ("hgfedcba" if flipFiles else "") + ("87654321" if flipRanks else "")
+    )
+    for flipFiles in [False, True] for flipRanks in [False, True]
+}
+
+# Parts of a move string: piece, disambiguation, capture, end square, and promotion and final symbol
+MOVE_PATTERN = re.compile(r"([A-Z]?)([a-h]?[1-8]?)(x?)([a-h][1-8])(.*)")
+
 # FEN dictionary for manually generated moves
 MANUAL_MOVES: dict[str, str] = {}
+# Starts of manually generated moves (piece and disambiguation) for skipping lookups of other moves
+MANUAL_MOVE_STARTS: set[str] = set()
+
+# Pool of worker processes for move generation (None if moves are generated in main process)
+PROCESS_POOL: Optional[ProcessPoolExecutor] = None
 
 # File and folder paths
 DIR_NAME          = os.path.dirname(__file__)
@@ -165,19 +228,13 @@ FONT = ImageFont.truetype(FONT_PATH, FONT_SIZE)
 ### Utils ###
 #############
 
-# Sign function
-def sign(x: int) -> int:
-    if x > 0:   return 1
-    elif x < 0: return -1
-    else:       return 0
-
 # Convert file index [0-7] to file name [a-h]
 def fileToStr(file: int) -> str:
-    return chr(ord("a") + file)
+    return FILE_NAMES[file]
 
 # Convert rank index [0-7] to rank name [1-8]
 def rankToStr(rank: int) -> str:
-    return str(1 + rank)
+    return RANK_NAMES[rank]
 
 # Convert file name [a-h] to file index [0-7]
 def strToFile(fileStr: str) -> int:
@@ -193,20 +250,7 @@ def strToSquare(squareStr: str) -> Square:
 
 # Flip files from [a-h] to [h-a] and ranks from [1-8] to [8-1] if corresponding flags are set
 def flipFileRank(string: str, flipFiles = False, flipRanks = False) -> str:
-
-    stringNew = ""
-    for c in string:
-        # Flip file
-        if c.islower() and flipFiles:
-            stringNew += fileToStr(7 - strToFile(c))
-        # Flip rank
-        elif c.isdigit() and flipRanks:
-            stringNew += rankToStr(7 - strToRank(c))
-        # Don't flip
-        else:
-            stringNew += c
-
-    return stringNew
+    return string.translate(FLIP_TABLES[flipFiles, flipRanks])
 
 # Get an empty 2D array as move group
 # First Dimension  | 0 No Capture | 1 Capture
@@ -217,71 +261,37 @@ def getEmptyMoveGroup() -> list[list[Optional[Board[str]]]]:
 # Parse move string into its parts
 def parseMove(move: str) -> tuple[str, str, str, str, str]:
 
-    piece = ""    # Piece symbol
-    capture = ""  # Capture symbol
-
-    # If move is not a pawn move
-    if move[0].isupper():
-        piece = move[0]
-        move = move[1:]
-
-    # Get middle part of move
-    coords = ""
-    while len(move) > 0 and move[0].isalnum():
-        # Capture move
-        if move[0] == "x":
-            capture = "x"
-        else:
-            coords += move[0]
-        move = move[1:]
-
-    disambiguation = coords[:-2] # Disambiguation for move
-    endSquare = coords[-2:]      # Name of end square
-    rest = move                  # Promotion and final symbol
+    match = MOVE_PATTERN.fullmatch(move)
+    if match is None:
+        raise ValueError(f"Invalid move: {move}")
 
+    (piece, disambiguation, capture, endSquare, rest) = match.groups()
     return (piece, disambiguation, capture, endSquare, rest)
 
 # Get FEN of a chessboard
 # Flip ranks, flip files, or swap color of pieces if corresponding flags are set
 def chessboardToFen(chessboard: Board[str], flipFiles=False, flipRanks=False, swapPlayers=False) -> str:
+    return chessboardToFenCached(tuple(chessboard.board), flipFiles, flipRanks, swapPlayers)
 
-    ranks: list[str] = []
-    # Loop through ranks in specified order
-    for rank in (range(7, -1, -1) if not flipRanks else range(8)):
-        emptySquares = 0
-        rankStr = ""
+# Get FEN from pieces of every square (see chessboardToFen)
+# Results are cached since the same chessboard is often found for several moves
+@lru_cache(maxsize=100_000)
+def chessboardToFenCached(pieces: tuple[str, ...], flipFiles: bool, flipRanks: bool, swapPlayers: bool) -> str:
 
-        # Loop through files in specified order
-        for file in (range(8) if not flipFiles else range(7, -1, -1)):
-            square = Square(file, rank)
+    # Write every empty square as "1" and join ranks in specified order
+    chessboardStr = "/".join("".join([pieces[index] or "1" for index in rank]) for rank in FEN_RANKS[flipFiles, flipRanks])
 
-            # Empty square
-            if chessboard[square] == "":
-                emptySquares += 1
-            # Piece
-            else:
-
-                # Append number of empty squares
-                if emptySquares > 0:
-                    rankStr += str(emptySquares)
-                    emptySquares = 0
-
-                # Append piece
-                # Swap color of piece if specified
-                if swapPlayers:
-                    rankStr += chessboard[square].swapcase()
-                else:
-                    rankStr += chessboard[square]
+    # Merge runs of empty squares into their count
+    for (run, count) in FEN_EMPTY_RUNS:
+        if run in chessboardStr:
+            chessboardStr = chessboardStr.replace(run, count)
 
-        # Append number of empty squares
-        if emptySquares > 0:
-            rankStr += str(emptySquares)
-
-        ranks.append(rankStr)
+    # Swap color of pieces if specified
+    if swapPlayers:
+        chessboardStr = chessboardStr.swapcase()
 
     # Build FEN string
     player = "b" if swapPlayers else "w"
-    chessboardStr = "/".join(ranks)
     fen = f"{chessboardStr} {player} - - 0 1"
 
     return fen
@@ -308,43 +318,167 @@ def fenToChessboard(fen: str) -> Board[str]:
     return chessboard
 
 # Check for checkmate
-def isCheckmate(squareKing: Square, attackedSquares: Board[Optional[Square]]) -> bool:
+def isCheckmate(squareKing: Square, attackedSquares: int) -> bool:
+    # All adjacent squares must be attacked
+    return KING_ATTACKS[squareKing.index] & ~attackedSquares == 0
 
-    # Check all adjacent squares
-    for jump in KING_JUMPS:
 
-        adjacentSquare = squareKing + jump
-        if not adjacentSquare.onBoard():
-            continue
+#################
+### Bitboards ###
+#################
 
-        # Found unattacked square
-        if not attackedSquares[adjacentSquare]:
-            return False
+# A bitboard is an int with bit 8 * file + rank set for every square contained in it
 
-    return True
+# Get bitboard containing a single square
+def squareBit(square: Square) -> int:
+    return 1 << square.index
+
+# Get squares contained in bitboard in order of SQUARES
+def getSquares(bitboard: int) -> Iterator[Square]:
+
+    while bitboard:
+        # Extract lowest set bit
+        bit = bitboard & -bitboard
+        bitboard ^= bit
+        yield SQUARES[bit.bit_length() - 1]
+
+# Get bitboard of all squares that can be reached from square by specified jumps
+def getJumpAttacks(square: Square, jumps: tuple[Offset, ...]) -> int:
+
+    attacks = 0
+    for jump in jumps:
+        endSquare = square + jump
+        if endSquare.onBoard():
+            attacks |= squareBit(endSquare)
+
+    return attacks
+
+# Get bitboards of all squares on the ray from every square in specified direction (excluding the square itself)
+# Also return whether the ray goes towards higher bit indices
+def getRays(direction: Offset) -> tuple[bool, list[int]]:
+
+    rays: list[int] = []
+    for square in SQUARES:
+        ray = 0
+        square = square + direction
+
+        # Go in this direction until edge of chessboard
+        while square.onBoard():
+            ray |= squareBit(square)
+            square += direction
+
+        rays.append(ray)
+
+    return (direction.file * 8 + direction.rank > 0, rays)
+
+# Get bitboards of all squares strictly between every two squares on a common line (0 if not on a line)
+def getBetween() -> list[list[int]]:
+
+    between = [[0] * 64 for _ in range(64)]
+    for square in SQUARES:
+        for direction in QUEEN_DIRECTIONS:
+            squaresBetween = 0
+            other = square + direction
+
+            # Go in this direction until edge of chessboard
+            while other.onBoard():
+                between[square.index][other.index] = squaresBetween
+                squaresBetween |= squareBit(other)
+                other += direction
+
+    return between
+
+# Get index of nearest occupied square on ray or -1 if ray is not blocked
+def getRayBlocker(positive: bool, ray: int, occupancy: int) -> int:
+
+    blockers = ray & occupancy
+    if not blockers:
+        return -1
+
+    # Nearest blocker is the lowest or highest set bit depending on direction
+    if positive:
+        return (blockers & -blockers).bit_length() - 1
+    else:
+        return blockers.bit_length() - 1
+
+# Get bitboard of all squares attacked by sliding piece on square with specified index
+# A ray ends at the first occupied square, which is attacked as well
+# Results are cached since a piece often sees the same occupancy on different chessboards
+@lru_cache(maxsize=200_000)
+def getSliderAttacks(piece: str, index: int, occupancy: int) -> int:
+
+    attacks = 0
+    for (positive, rays) in SLIDER_RAYS[piece]:
+        ray = rays[index]
+        blocker = getRayBlocker(positive, ray, occupancy)
+
+        # Cut off ray behind blocker
+        if blocker >= 0:
+            ray ^= rays[blocker]
+
+        attacks |= ray
+
+    return attacks
+
+# Get bitboard of all occupied squares
+def getOccupancy(chessboard: Board[str]) -> int:
+    return sum(compress(SQUARE_BITS, chessboard.board))
+
+# Bitboard containing all squares
+ALL_SQUARES = (1 << 64) - 1
+# Bitboard of every single square
+SQUARE_BITS = [squareBit(square) for square in SQUARES]
+
+# Bitboards of squares within distance 1 and 2 of every square (including square itself)
+ADJACENT   = [sum(squareBit(other) for other in SQUARES if square.isAdjacent(other)) for square in SQUARES]
+ADJACENT_2 = [sum(squareBit(other) for other in SQUARES if square.isAdjacent(other, 2)) for square in SQUARES]
+
+# Bitboards of squares on edge of chessboard and in corners of chessboard
+EDGE_SQUARES   = sum(squareBit(square) for square in SQUARES if square.file in [0, 7] or square.rank in [0, 7])
+CORNER_SQUARES = sum(squareBit(square) for square in SQUARES if square.file in [0, 7] and square.rank in [0, 7])
+
+# Attack bitboards of jump pieces for every square
+PAWN_ATTACKS   = [getJumpAttacks(square, PAWN_JUMPS) for square in SQUARES]
+KING_ATTACKS   = [getJumpAttacks(square, KING_JUMPS) for square in SQUARES]
+KNIGHT_ATTACKS = [getJumpAttacks(square, KNIGHT_JUMPS) for square in SQUARES]
+
+# Bitboards of squares from which white pawn attacks every square
+PAWN_ATTACKERS = [getJumpAttacks(square, tuple(Offset(-file, -rank) for (file, rank) in PAWN_JUMPS)) for square in SQUARES]
+
+# Ray bitboards of sliding pieces for every direction and square
+ROOK_RAYS   = [getRays(direction) for direction in ROOK_DIRECTIONS]
+BISHOP_RAYS = [getRays(direction) for direction in BISHOP_DIRECTIONS]
+QUEEN_RAYS  = ROOK_RAYS + BISHOP_RAYS
+
+# Bitboards of squares between every two squares
+BETWEEN = getBetween()
+
+# Attack bitboards of white jump pieces and ray bitboards of white sliding pieces by piece symbol
+JUMP_ATTACKS = {"P": PAWN_ATTACKS, "K": KING_ATTACKS, "N": KNIGHT_ATTACKS}
+SLIDER_RAYS  = {"B": BISHOP_RAYS, "R": ROOK_RAYS, "Q": QUEEN_RAYS}
 
 ######################
 ### Piece movement ###
 ######################
 
 # Get list of start squares from end square for jump pieces
-def getStartSquaresJump(endSquare: Square, jumps: list[Offset]) -> list[Square]:
+def getStartSquaresJump(endSquare: Square, jumps: tuple[Offset, ...]) -> list[Square]:
 
     startSquares: list[Square] = []
 
     # For every jump
-    for (directionId, jump) in enumerate(jumps):
-        startSquare = endSquare - jump
-        startSquare.directionId = directionId
+    for (directionId, (fileOffset, rankOffset)) in enumerate(jumps):
+        file = endSquare.file - fileOffset
+        rank = endSquare.rank - rankOffset
 
         # Add square to list if it is on chessboard
-        if startSquare.onBoard():
-            startSquares.append(startSquare)
+        if 0 <= file <= 7 and 0 <= rank <= 7:
+            startSquares.append(Square(file, rank, directionId))
 
     return startSquares
 
 # Get list of start squares from end square for direction pieces
-def getStartSquaresDirection(endSquare: Square, directions: list[Offset]) -> list[Square]:
+def getStartSquaresDirection(endSquare: Square, directions: tuple[Offset, ...]) -> list[Square]:
 
     startSquares: list[Square] = []
 
@@ -360,65 +494,85 @@ def getStartSquaresDirection(endSquare: Square, directions: list[Offset]) -> lis
 
     return startSquares
 
-# Mark all squares that can be reached from starting square by specified jumps as attacked
-def markAttackedSquaresJump(startSquare: Square, attackedSquares: Board[Optional[Square]], jumps: list[Offset]
-    ) -> None:
-
-    # For every jump
-    for jump in jumps:
-        endSquare = startSquare + jump
-
-        # Mark end square if it is on chessboard
-        if endSquare.onBoard():
+# Start squares from every end square for movements of all pieces
+# Square objects are shared, so they must not be modified
+START_SQUARES: dict[tuple[Offset, ...], list[tuple[Square, ...]]] = {
+    **{jumps: [tuple(getStartSquaresJump(square, jumps)) for square in SQUARES]
+        for jumps in [PAWN_JUMPS, KING_JUMPS, KNIGHT_JUMPS]},
+    **{directions: [tuple(getStartSquaresDirection(square, directions)) for square in SQUARES]
+        for directions in [ROOK_DIRECTIONS, BISHOP_DIRECTIONS, QUEEN_DIRECTIONS]}
+}
+
+# Adjacent squares of every square in specified directions (in order of directions, only squares on chessboard)
+# Square objects are shared, so they must not be modified
+NEIGHBORS: dict[tuple[Offset, ...], list[tuple[Square, ...]]] = {
+    directions: [tuple(SQUARES[(square + direction).index] for direction in directions if (square + direction).onBoard())
+        for square in SQUARES]
+    for directions in [ROOK_DIRECTIONS, BISHOP_DIRECTIONS]
+}
+
+# Get bitboard of all squares attacked by white pieces on chessboard
+def getAttackedSquares(chessboard: Board[str]) -> int:
+    return getAttackedSquaresCached(tuple(chessboard.board))
+
+# Get bitboard of all squares attacked by white pieces from pieces of every square
+# Results are cached since the same chessboards are evaluated many times
+@lru_cache(maxsize=200_000)
+def getAttackedSquaresCached(pieces: tuple[str, ...]) -> int:
+
+    # Attacks of sliding pieces depend on complete occupancy
+    occupancy = sum(compress(SQUARE_BITS, pieces))
+    attackedSquares = 0
+
+    # Only visit occupied squares
+    for index in compress(range(64), pieces):
+        piece = pieces[index]
+
+        if piece in JUMP_ATTACKS:
+            attackedSquares |= JUMP_ATTACKS[piece][index]
+        elif piece in SLIDER_RAYS:
+            attackedSquares |= getSliderAttacks(piece, index, occupancy)
 
-            if endSquare.isAdjacent(startSquare):
-                attackedSquares[endSquare] = startSquare
-            else:
-                attackedSquares[endSquare] = Square(-1, -1)
+    return attackedSquares
 
-# Mark all squares that can be reached from starting square in specified directions as attacked
-def markAttackedSquaresDirection(square: Square, chessboard: Board[str], attackedSquares: Board[Optional[Square]],
-    directions: list[Offset]) -> None:
+# Get adjacent square that has to be kept free in order for the attack on square to happen
+# If several pieces attack square, the one on the last square is considered
+# Return Square(-1, -1) for knight attacks and None if square is not attacked
+def getAttackKeepFree(chessboard: Board[str], square: Square) -> Optional[Square]:
 
-    # For every direction
-    for direction in directions:
-        squarePrevious = square
-        squareCurrent = square + direction
+    occupancy = getOccupancy(chessboard)
+    index = square.index
+    attackerIndex = -1
+    keepFree = None
 
-        # Go in this direction until edge or other piece
-        while squareCurrent.onBoard():
-            attackedSquares[squareCurrent] = squarePrevious
+    # Sliding pieces attack from nearest piece in every direction
+    for (directionId, direction) in enumerate(QUEEN_DIRECTIONS):
+        (positive, rays) = QUEEN_RAYS[directionId]
+        blocker = getRayBlocker(positive, rays[index], occupancy)
 
-            # Direction is block by other piece
-            if chessboard[squareCurrent] != "":
-                break
+        if blocker <= attackerIndex:
+            continue
 
-            squarePrevious = squareCurrent
-            squareCurrent = squareCurrent + direction
+        # Rook directions come first in queen directions
+        if chessboard.board[blocker] in ["Q", "R" if directionId < 4 else "B"]:
+            attackerIndex = blocker
+            keepFree = SQUARES[index + (direction.file << 3) + direction.rank]
 
-# Get board of attacked squares from chessboard
-# The value of a square is an adjacent square that has to be kept free in order for the attack to happen
-def getAttackedSquares(chessboard: Board[str]) -> Board[Optional[Square]]:
+    # Jump pieces attack from squares that can be reached by reversed jump
+    for (piece, attackers) in [("P", PAWN_ATTACKERS), ("K", KING_ATTACKS), ("N", KNIGHT_ATTACKS)]:
+        candidates = attackers[index] & occupancy
 
-    attackedSquares: Board[Optional[Square]] = Board(None)
+        while candidates:
+            bit = candidates & -candidates
+            candidates ^= bit
+            start = bit.bit_length() - 1
 
-    for square in SQUARES:
-        piece = chessboard[square]
-
-        if piece == "P":   # Pawn
-            markAttackedSquaresJump(square, attackedSquares, PAWN_JUMPS)
-        elif piece == "K": # King
-            markAttackedSquaresJump(square, attackedSquares, KING_JUMPS)
-        elif piece == "N": # Knight
-            markAttackedSquaresJump(square, attackedSquares, KNIGHT_JUMPS)
-        elif piece == "B": # Bishop
-            markAttackedSquaresDirection(square, chessboard, attackedSquares, BISHOP_DIRECTIONS)
-        elif piece == "R": # Rook
-            markAttackedSquaresDirection(square, chessboard, attackedSquares, ROOK_DIRECTIONS)
-        elif piece == "Q": # Queen
-            markAttackedSquaresDirection(square, chessboard, attackedSquares, QUEEN_DIRECTIONS)
+            if start > attackerIndex and chessboard.board[start] == piece:
+                attackerIndex = start
+                # Knight attack can't be blocked
+                keepFree = SQUARES[start] if piece != "N" else Square(-1, -1)
 
-    return attackedSquares
+    return keepFree
 
 
 #############################
@@ -427,27 +581,18 @@ def getAttackedSquares(chessboard: Board[str]) -> Board[Optional[Square]]:
 
 # Place white king on chessboard
 # Return whether placement was possible
-def placeWhiteKing(chessboard: Board[str], keepFree: Board[bool], attackedSquaresAfter: Board[Optional[Square]],
+def placeWhiteKing(chessboard: Board[str], keepFree: int, attackedSquaresAfter: int,
     squareBlackKing: Square) -> bool:
 
-    # Test all square
-    for square in SQUARES:
-
-        # Square must be kept free for move
-        if keepFree[square]:
-            continue
-
-        # White king can't be on a square that is attacked after move
-        # Otherwise white king might block attack on black king
-        if attackedSquaresAfter[square]:
-            continue
-
-        # White king can't be adjacent to black king or its escape squares
-        # Otherwise position might be illegal or stalemate
-        if square.isAdjacent(squareBlackKing, 2):
-            continue
+    # Square must be kept free for move
+    # White king can't be on a square that is attacked after move
+    # Otherwise white king might block attack on black king
+    # White king can't be adjacent to black king or its escape squares
+    # Otherwise position might be illegal or stalemate
+    candidates = ALL_SQUARES & ~(keepFree | attackedSquaresAfter | ADJACENT_2[squareBlackKing.index])
 
-        # Place white king
+    # Place white king on first candidate square
+    for square in getSquares(candidates):
         chessboard[square] = "K"
         return True
 
@@ -457,25 +602,18 @@ def placeWhiteKing(chessboard: Board[str], keepFree: Board[bool], attackedSquare
 # Place white pieces around black king such that all squares adjacent to it are attacked
 # Return whether placement was possible
 def boxInBlackKing(blackKingSquare: Square, endSquare: Square, chessboardBefore: Board[str], chessboardAfter: Board[str],
-    attackedSquaresAfter: Board[Optional[Square]]) -> bool:
-
-    keepFreeForAttack = cast(Square, attackedSquaresAfter[blackKingSquare])
+    attackedSquaresAfter: int, keepFreeForAttack: Square) -> bool:
 
     # Plan to place four rooks in corners of 3x3 box around black king
-    rookSquares: list[Square] = []
-    for offset in BISHOP_DIRECTIONS:
-        squareRook = blackKingSquare + offset
-
-        if squareRook.onBoard():
-            rookSquares.append(squareRook)
+    rookSquares = list(NEIGHBORS[BISHOP_DIRECTIONS][blackKingSquare.index])
 
     # Black king in corner
-    if (blackKingSquare.file in [0, 7]) and (blackKingSquare.rank in [0, 7]):
+    if CORNER_SQUARES & squareBit(blackKingSquare):
         # Ignore this case
         return False
 
     # Black king on edge
-    elif (blackKingSquare.file in [0, 7]) or (blackKingSquare.rank in [0, 7]):
+    elif EDGE_SQUARES & squareBit(blackKingSquare):
 
         # Rook blocks attack on black king
         if keepFreeForAttack in rookSquares:
@@ -483,7 +621,7 @@ def boxInBlackKing(blackKingSquare: Square, endSquare: Square, chessboardBefore:
             # If attacker is next to black king, it has to be protected
             # Otherwise it could be taken by black king and it wouldn't be checkmate
             if chessboardAfter[keepFreeForAttack].isupper():
-                if not attackedSquaresAfter[keepFreeForAttack]:
+                if not attackedSquaresAfter & squareBit(keepFreeForAttack):
                     return False
 
             # Remove blocking rook
@@ -494,7 +632,7 @@ def boxInBlackKing(blackKingSquare: Square, endSquare: Square, chessboardBefore:
             knightSquare = Square(blackKingSquare.file, keepFreeForAttack.rank)
             bishopSquare = Square(keepFreeForAttack.file, blackKingSquare.rank)
 
-            if (bishopSquare.file in [0, 7]) or (bishopSquare.rank in [0, 7]):
+            if EDGE_SQUARES & squareBit(bishopSquare):
                 (knightSquare, bishopSquare) = (bishopSquare, knightSquare)
 
             chessboardBefore[knightSquare] = "N"
@@ -509,7 +647,7 @@ def boxInBlackKing(blackKingSquare: Square, endSquare: Square, chessboardBefore:
         else:
 
             # Moving a rook next to black king as an attacker messes up disambiguation
-            if chessboardAfter[endSquare] == "R" and endSquare.isAdjacent(blackKingSquare):
+            if chessboardAfter[endSquare] == "R" and ADJACENT[blackKingSquare.index] & squareBit(endSquare):
                 return False
 
             # Result:
@@ -521,7 +659,7 @@ def boxInBlackKing(blackKingSquare: Square, endSquare: Square, chessboardBefore:
     else:
 
         # Moving a rook next to black king as an attacker messes up disambiguation
-        if chessboardAfter[endSquare] == "R" and endSquare.isAdjacent(blackKingSquare):
+        if chessboardAfter[endSquare] == "R" and ADJACENT[blackKingSquare.index] & squareBit(endSquare):
             return False
 
         # Remove rook when it blocks attack on black king
@@ -546,28 +684,22 @@ def boxInBlackKing(blackKingSquare: Square, endSquare: Square, chessboardBefore:
 
 # Place black and white king on chessboard such that black king is not in check
 # Return chessboard of such position if one is found else return None
-def placeKingsNoCheck(endSquare: Square, chessboardBefore: Board[str], chessboardAfter: Board[str], keepFree: Board[bool],
-    hasWhiteKing: bool) -> Optional[Board[str]]:
+def placeKingsNoCheck(endSquare: Square, chessboardBefore: Board[str], chessboardAfter: Board[str],
+    attackedSquaresBefore: int, attackedSquaresAfter: int, keepFree: int, hasWhiteKing: bool) -> Optional[Board[str]]:
 
-    chessboardBefore = deepcopy(chessboardBefore)
-    attackedSquaresBefore = getAttackedSquares(chessboardBefore)
-    attackedSquaresAfter = getAttackedSquares(chessboardAfter)
+    chessboardBefore = chessboardBefore.copy()
     squareBlackKing = None
 
-    # Test all squares
-    for square in SQUARES:
+    # Square must be kept free for move
+    # Black king can't be attacked before and after move
+    candidates = ALL_SQUARES & ~(keepFree | attackedSquaresBefore | attackedSquaresAfter)
 
-        # Square must be kept free for move
-        if keepFree[square]:
-            continue
+    # Black king can't be adjacent to white king
+    if hasWhiteKing:
+        candidates &= ~ADJACENT[endSquare.index]
 
-        # Black king can't be attacked before and after move
-        if attackedSquaresBefore[square] or attackedSquaresAfter[square]:
-            continue
-
-        # Black king can't be adjacent to white king
-        if hasWhiteKing and square.isAdjacent(endSquare):
-            continue
+    # Test all candidate squares
+    for square in getSquares(candidates):
 
         # Place black king
         chessboardBefore[square] = "k"
@@ -588,32 +720,23 @@ def placeKingsNoCheck(endSquare: Square, chessboardBefore: Board[str], chessboar
 
 # Place black and white king on chessboard such that black king is in check
 # Return chessboard of such position if one is found else return None
-def placeKingsCheck(endSquare: Square, chessboardBefore: Board[str], chessboardAfter: Board[str], keepFree: Board[bool],
-    hasWhiteKing: bool) -> Optional[Board[str]]:
+def placeKingsCheck(endSquare: Square, chessboardBefore: Board[str], chessboardAfter: Board[str],
+    attackedSquaresBefore: int, attackedSquaresAfter: int, keepFree: int, hasWhiteKing: bool) -> Optional[Board[str]]:
 
-    chessboardBefore = deepcopy(chessboardBefore)
-    attackedSquaresBefore = getAttackedSquares(chessboardBefore)
-    attackedSquaresAfter = getAttackedSquares(chessboardAfter)
+    chessboardBefore = chessboardBefore.copy()
     squareBlackKing = None
 
-    # Test all squares
-    for square in SQUARES:
-
-        # Square must be kept free for move
-        if keepFree[square]:
-            continue
+    # Black king must be attacked after move
+    # Square must be kept free for move
+    # Black king can't be attacked before move
+    candidates = attackedSquaresAfter & ~(keepFree | attackedSquaresBefore)
 
-        # Black king can't be attacked before move
-        if attackedSquaresBefore[square]:
-            continue
+    # Black king can't be adjacent to white king
+    if hasWhiteKing:
+        candidates &= ~ADJACENT[endSquare.index]
 
-        # Black king must be attacked after move
-        if not attackedSquaresAfter[square]:
-            continue
-
-        # Black king can't be adjacent to white king
-        if hasWhiteKing and square.isAdjacent(endSquare):
-            continue
+    # Test all candidate squares
+    for square in getSquares(candidates):
 
         # Place king if there is no checkmate
         if not isCheckmate(square, attackedSquaresAfter):
@@ -635,32 +758,23 @@ def placeKingsCheck(endSquare: Square, chessboardBefore: Board[str], chessboardA
 
 # Place black and white king on chessboard such that black king is checkmated
 # Return chessboard of such position if one is found else return None
-def placeKingsCheckmate(endSquare: Square, chessboardBefore: Board[str], chessboardAfter: Board[str], keepFree: Board[bool],
-    hasWhiteKing: bool) -> Optional[Board[str]]:
+def placeKingsCheckmate(endSquare: Square, chessboardBefore: Board[str], chessboardAfter: Board[str],
+    attackedSquaresBefore: int, attackedSquaresAfter: int, keepFree: int, hasWhiteKing: bool) -> Optional[Board[str]]:
 
-    chessboardBefore = deepcopy(chessboardBefore)
-    attackedSquaresBefore = getAttackedSquares(chessboardBefore)
-    attackedSquaresAfter = getAttackedSquares(chessboardAfter)
+    chessboardBefore = chessboardBefore.copy()
     squareBlackKing = None
 
-    # Test all squares
-    for square in SQUARES:
-
-        # Square must be kept free for move
-        if keepFree[square]:
-            continue
-
-        # Black king can't be attacked before move
-        if attackedSquaresBefore[square]:
-            continue
+    # Black king must be attacked after move
+    # Square must be kept free for move
+    # Black king can't be attacked before move
+    candidates = attackedSquaresAfter & ~(keepFree | attackedSquaresBefore)
 
-        # Black king must be attacked after move
-        if not attackedSquaresAfter[square]:
-            continue
+    # Black king can't be adjacent to white king
+    if hasWhiteKing:
+        candidates &= ~ADJACENT[endSquare.index]
 
-        # Black king can't be adjacent to white king
-        if hasWhiteKing and square.isAdjacent(endSquare):
-            continue
+    # Test all candidate squares
+    for square in getSquares(candidates):
 
         # Check for checkmate
         if isCheckmate(square, attackedSquaresAfter):
@@ -672,30 +786,23 @@ def placeKingsCheckmate(endSquare: Square, chessboardBefore: Board[str], chessbo
 
         # Check whether pieces can be placed on all adjacent squares
         # Except for square that has to be kept free for attack
-        adjacentAllPlacable = True
-        keepFreeForAttack = cast(Square, attackedSquaresAfter[square])
-
-        for jump in KING_JUMPS:
+        adjacentKeepFree = KING_ATTACKS[square.index] & keepFree
 
-            adjacentSquare = square + jump
-            if not adjacentSquare.onBoard():
-                continue
+        # More than one adjacent square is not placable
+        if adjacentKeepFree & (adjacentKeepFree - 1):
+            continue
 
-            # Exclude square that has to be kept free for attack
-            if adjacentSquare == keepFreeForAttack:
-                continue
+        # Square that has to be kept free for attack is only needed from here on
+        keepFreeForAttack = cast(Square, getAttackKeepFree(chessboardAfter, square))
 
-            # Square is not placable
-            if keepFree[adjacentSquare]:
-                adjacentAllPlacable = False
-                break
+        # Only adjacent square that is not placable must be the one kept free for attack
+        if adjacentKeepFree and not (keepFreeForAttack.onBoard() and adjacentKeepFree == squareBit(keepFreeForAttack)):
+            continue
 
-        # All adjacent squares are placable
-        if adjacentAllPlacable:
-            # Place white piece around black king
-            if boxInBlackKing(square, endSquare, chessboardBefore, chessboardAfter, attackedSquaresAfter):
-                squareBlackKing = square
-                break
+        # Place white piece around black king
+        if boxInBlackKing(square, endSquare, chessboardBefore, chessboardAfter, attackedSquaresAfter, keepFreeForAttack):
+            squareBlackKing = square
+            break
 
     # Black king couldn't be placed
     if not squareBlackKing:
@@ -711,14 +818,19 @@ def placeKingsCheckmate(endSquare: Square, chessboardBefore: Board[str], chessbo
 
 # Update move group with chessboards of capture or non-capture moves from partial chessboard
 def updateMoveGroupCapture(moveGroupCapture: list[Optional[Board[str]]], piece: str, startSquare: Square, endSquare: Square,
-    chessboardBefore: Board[str], chessboardAfter: Board[str], keepFree: Board[bool]) -> None:
+    chessboardBefore: Board[str], chessboardAfter: Board[str], keepFree: int) -> None:
+
+    # Attacked squares are shared by all placements on the same chessboards
+    attackedSquaresBefore = getAttackedSquares(chessboardBefore)
+    attackedSquaresAfter = getAttackedSquares(chessboardAfter)
 
     # Generate chessboards for no check, check, and checkmate
     placeFunctions = [placeKingsNoCheck, placeKingsCheck, placeKingsCheckmate]
     hasWhiteKing = piece == "K"
     for i in range(3):
         if not moveGroupCapture[i]:
-            moveGroupCapture[i] = placeFunctions[i](endSquare, chessboardBefore, chessboardAfter, keepFree, hasWhiteKing)
+            moveGroupCapture[i] = placeFunctions[i](endSquare, chessboardBefore, chessboardAfter,
+                attackedSquaresBefore, attackedSquaresAfter, keepFree, hasWhiteKing)
 
     # Place piece for discovered attack
     for (pieceDiscovered, offsets) in [("R", ROOK_DIRECTIONS), ("B", BISHOP_DIRECTIONS)]:
@@ -727,114 +839,128 @@ def updateMoveGroupCapture(moveGroupCapture: list[Optional[Board[str]]], piece:
         if piece in ["Q", pieceDiscovered]:
             continue
 
-        for offset in offsets:
-            squareAttacker = startSquare + offset
-
-            if not squareAttacker.onBoard():
-                continue
+        for squareAttacker in NEIGHBORS[offsets][startSquare.index]:
 
             # Check and checkmate already found
             if moveGroupCapture[1] and moveGroupCapture[2]:
                 break
 
             # Square must be kept free for move
-            if keepFree[squareAttacker]:
+            if keepFree & squareBit(squareAttacker):
                 continue
 
             # Place discovered attacker
-            chessboardBefore[squareAttacker] = pieceDiscovered
-            chessboardAfter[squareAttacker] = pieceDiscovered
-            keepFree[squareAttacker] = True
+            chessboardBefore.board[squareAttacker.index] = pieceDiscovered
+            chessboardAfter.board[squareAttacker.index] = pieceDiscovered
+            keepFreeDiscovered = keepFree | squareBit(squareAttacker)
+            attackedSquaresBefore = getAttackedSquares(chessboardBefore)
+            attackedSquaresAfter = getAttackedSquares(chessboardAfter)
 
             # Generate chessboard for check
             if not moveGroupCapture[1]:
-                moveGroupCapture[1] = placeKingsCheck(endSquare, chessboardBefore, chessboardAfter, keepFree, hasWhiteKing)
+                moveGroupCapture[1] = placeKingsCheck(endSquare, chessboardBefore, chessboardAfter,
+                    attackedSquaresBefore, attackedSquaresAfter, keepFreeDiscovered, hasWhiteKing)
 
             # Generate chessboard for checkmate
             if not moveGroupCapture[2]:
-                moveGroupCapture[2] = placeKingsCheckmate(endSquare, chessboardBefore, chessboardAfter, keepFree, hasWhiteKing)
+                moveGroupCapture[2] = placeKingsCheckmate(endSquare, chessboardBefore, chessboardAfter,
+                    attackedSquaresBefore, attackedSquaresAfter, keepFreeDiscovered, hasWhiteKing)
 
             # Remove discovered attacker
-            chessboardBefore[squareAttacker] = ""
-            chessboardAfter[squareAttacker] = ""
-            keepFree[squareAttacker] = False
+            chessboardBefore.board[squareAttacker.index] = ""
+            chessboardAfter.board[squareAttacker.index] = ""
 
 # Update move group with chessboards generated from piece locations
 def updateMoveGroup(moveGroup: list[list[Optional[Board[str]]]], piece: str, startSquare: Square, endSquare: Square,
     otherSquares: list[Square], promotePiece="") -> None:
 
     # Return if move group is already full
-    alreadyFull = True
-    for i in range(2):
-        for j in range(3):
-            if not moveGroup[i][j]:
-                alreadyFull = False
-
-    if alreadyFull:
+    if all(moveGroup[0]) and all(moveGroup[1]):
         return
 
     chessboardBefore = Board("")
-    keepFree = Board(False)
+    keepFree = 0
 
     # Place pieces on chessboard and calculate squares that must be kept free for move
     for square in [startSquare] + otherSquares:
 
         # Place piece
-        chessboardBefore[square] = piece
+        chessboardBefore.board[square.index] = piece
 
         # Knight
         if piece == "N":
             # Mark start square of knight
-            keepFree[square] = True
+            keepFree |= squareBit(square)
 
         # Piece except knight
         else:
             # Mark start square and line of attack
-            direction = Offset(sign(endSquare.file - square.file), sign(endSquare.rank - square.rank))
-            while square != endSquare:
-                keepFree[square] = True
-                square += direction
+            keepFree |= squareBit(square) | BETWEEN[square.index][endSquare.index]
 
         # Mark end square
-        keepFree[endSquare] = True
+        keepFree |= squareBit(endSquare)
 
     # Calculate chessboard after move
-    chessboardAfter = deepcopy(chessboardBefore)
-    chessboardAfter[startSquare] = ""
-    chessboardAfter[endSquare] = piece if promotePiece == "" else promotePiece
+    chessboardAfter = chessboardBefore.copy()
+    chessboardAfter.board[startSquare.index] = ""
+    chessboardAfter.board[endSquare.index] = piece if promotePiece == "" else promotePiece
 
     # Update move group with chessboards of non-capture moves
     updateMoveGroupCapture(moveGroup[0], piece, startSquare, endSquare, chessboardBefore, chessboardAfter, keepFree)
 
     # Update move group with chessboards of capture moves
-    chessboardBefore[endSquare] = "n"
+    chessboardBefore.board[endSquare.index] = "n"
     updateMoveGroupCapture(moveGroup[1], piece, startSquare, endSquare, chessboardBefore, chessboardAfter, keepFree)
 
+# Get move group of a single piece moving from start square to end square
+# Results are cached since SAN and LAN moves (and moves of both players for pawns) need the same move groups,
+# so they must not be modified
+# Each worker process has its own cache, so with a process pool they are only shared within one worker
+@lru_cache(maxsize=None)
+def getMoveGroupSingle(piece: str, startSquare: Square, endSquare: Square, promotePiece=""
+    ) -> list[list[Optional[Board[str]]]]:
+
+    moveGroup = getEmptyMoveGroup()
+    updateMoveGroup(moveGroup, piece, startSquare, endSquare, [], promotePiece)
+
+    return moveGroup
+
 # Insert move group into move list
+# Skip no capture (0) or capture (1) moves if specified
 # Return whether moves were inserted
 def insertMoves(moves: list[tuple[str, str]], moveStart: str, moveEnd: str, moveGroup: list[list[Optional[Board[str]]]],
-    stats: Stats, flipForPawn=False) -> bool:
+    stats: Stats, flipForPawn=False, skip: Optional[int] = None) -> bool:
 
     movesInserted = False
     moveFens: list[list[Optional[tuple[str, str]]]] = [[None] * 3 for _ in range(2)]
+    hasManualMoves = moveStart in MANUAL_MOVE_STARTS
 
     # For no capture and capture moves
     for i in range(2):
-        capture = "" if i == 0 else "x"
+        if i == skip:
+            continue
+
+        # Nothing to insert if no move was found and there are no manual moves
+        moveGroupCapture = moveGroup[i]
+        if not hasManualMoves and not any(moveGroupCapture):
+            continue
+
+        # Move string without final symbol
+        moveBase = moveStart + ("" if i == 0 else "x") + moveEnd
 
         # For every final symbol
         for (j, finalSymbol) in enumerate(FINAL_SYMBOL):
 
-            move = moveStart + capture + moveEnd + finalSymbol
+            move = moveBase + finalSymbol
             fen = ""
 
             # Move was found
-            if moveGroup[i][j]:
-                chessboard = cast(Board[str], moveGroup[i][j])
+            if moveGroupCapture[j]:
+                chessboard = cast(Board[str], moveGroupCapture[j])
                 fen = chessboardToFen(chessboard, flipRanks=flipForPawn, swapPlayers=flipForPawn)
 
             # If move was not found, use manual move if available
-            elif move in MANUAL_MOVES:
+            elif hasManualMoves and move in MANUAL_MOVES:
                 fen = MANUAL_MOVES[move]
 
             # If move is possible, insert it into move list
@@ -872,12 +998,12 @@ def insertMoves(moves: list[tuple[str, str]], moveStart: str, moveEnd: str, move
 def getMovesPawnSingle(endSquare: Square, player: str, stats: Stats, san: bool) -> list[tuple[str, str]]:
 
     moves: list[tuple[str, str]] = []
-    endSquareStr = str(endSquare)
+    endSquareStr = SQUARE_NAMES[endSquare.index]
 
     # Flip ranks if player is black
     flip = player == "b"
     if flip:
-        endSquare = Square(endSquare.file, 7 - endSquare.rank)
+        endSquare = SQUARES[endSquare.index ^ 7]
 
     # Single square move not possible
     if endSquare.rank < 2:
@@ -888,9 +1014,8 @@ def getMovesPawnSingle(endSquare: Square, player: str, stats: Stats, san: bool)
     for promotePiece in promotionOptions:
 
         # Generate non-capture moves
-        startSquare = endSquare + Offset(0, -1)
-        moveGroup = getEmptyMoveGroup()
-        updateMoveGroup(moveGroup, "P", startSquare, endSquare, [], promotePiece)
+        startSquare = SQUARES[endSquare.index - 1]
+        moveGroup = getMoveGroupSingle("P", startSquare, endSquare, promotePiece)
 
         # Start of move string
         if san:
@@ -902,9 +1027,8 @@ def getMovesPawnSingle(endSquare: Square, player: str, stats: Stats, san: bool)
         promote = "" if promotePiece == "" else "=" + promotePiece
         moveEnd = endSquareStr + promote
 
-        # Move group also contains capture moves, so delete them before insertion into move list
-        moveGroup[1] = [None] * 3
-        insertMoves(moves, moveStart, moveEnd, moveGroup, stats, flip)
+        # Move group also contains capture moves, so skip them during insertion into move list
+        insertMoves(moves, moveStart, moveEnd, moveGroup, stats, flip, 1)
 
     return moves
 
@@ -912,12 +1036,12 @@ def getMovesPawnSingle(endSquare: Square, player: str, stats: Stats, san: bool)
 def getMovesPawnCapture(endSquare: Square, player: str, stats: Stats, san: bool) -> list[tuple[str, str]]:
 
     moves: list[tuple[str, str]] = []
-    endSquareStr = str(endSquare)
+    endSquareStr = SQUARE_NAMES[endSquare.index]
 
     # Flip ranks if player is black
     flip = player == "b"
     if flip:
-        endSquare = Square(endSquare.file, 7 - endSquare.rank)
+        endSquare = SQUARES[endSquare.index ^ 7]
 
     # Capture move not possible
     if endSquare.rank < 2:
@@ -928,27 +1052,23 @@ def getMovesPawnCapture(endSquare: Square, player: str, stats: Stats, san: bool)
     for promotePiece in promotionOptions:
 
         # For both adjacent files
-        for offset in [Offset(-1, -1), Offset(1, -1)]:
-            startSquare = endSquare + offset
-            if startSquare.onBoard():
+        for startSquare in START_SQUARES[PAWN_JUMPS][endSquare.index]:
 
-                # Generate capture moves
-                moveGroup = getEmptyMoveGroup()
-                updateMoveGroup(moveGroup, "P", startSquare, endSquare, [], promotePiece)
+            # Generate capture moves
+            moveGroup = getMoveGroupSingle("P", startSquare, endSquare, promotePiece)
 
-                # Start of move string
-                if san:
-                    moveStart = fileToStr(startSquare.file)
-                else:
-                    moveStart = flipFileRank(str(startSquare), flipRanks=flip)
+            # Start of move string
+            if san:
+                moveStart = FILE_NAMES[startSquare.file]
+            else:
+                moveStart = flipFileRank(str(startSquare), flipRanks=flip)
 
-                # End of move string
-                promote = "" if promotePiece == "" else "=" + promotePiece
-                moveEnd = endSquareStr + promote
+            # End of move string
+            promote = "" if promotePiece == "" else "=" + promotePiece
+            moveEnd = endSquareStr + promote
 
-                # Move group also contains non-capture moves, so delete them before insertion into move list
-                moveGroup[0] = [None] * 3
-                insertMoves(moves, moveStart, moveEnd, moveGroup, stats, flip)
+            # Move group also contains non-capture moves, so skip them during insertion into move list
+            insertMoves(moves, moveStart, moveEnd, moveGroup, stats, flip, 0)
 
     return moves
 
@@ -956,29 +1076,27 @@ def getMovesPawnCapture(endSquare: Square, player: str, stats: Stats, san: bool)
 def getMovesPawnDouble(endSquare: Square, player: str, stats: Stats) -> list[tuple[str, str]]:
 
     moves: list[tuple[str, str]] = []
-    endSquareStr = str(endSquare)
+    endSquareStr = SQUARE_NAMES[endSquare.index]
 
     # Flip ranks if player is black
     flip = player == "b"
     if flip:
-        endSquare = Square(endSquare.file, 7 - endSquare.rank)
+        endSquare = SQUARES[endSquare.index ^ 7]
 
     # Double square move not possible
     if endSquare.rank != 3:
         return moves
 
     # Generate non-capture moves
-    startSquare = endSquare + Offset(0, -2)
-    moveGroup = getEmptyMoveGroup()
-    updateMoveGroup(moveGroup, "P", startSquare, endSquare, [])
+    startSquare = SQUARES[endSquare.index - 2]
+    moveGroup = getMoveGroupSingle("P", startSquare, endSquare)
 
     # End and start of move string
     moveStart = flipFileRank(str(startSquare), flipRanks=flip)
     moveEnd = endSquareStr
 
-    # Move group also contains capture moves, so delete them before insertion into move list
-    moveGroup[1] = [None] * 3
-    insertMoves(moves, moveStart, moveEnd, moveGroup, stats, flip)
+    # Move group also contains capture moves, so skip them during insertion into move list
+    insertMoves(moves, moveStart, moveEnd, moveGroup, stats, flip, 1)
 
     return moves
 
@@ -986,7 +1104,7 @@ def getMovesPawnDouble(endSquare: Square, player: str, stats: Stats) -> list[tup
 def getMovesCastle() -> resultType:
 
     moves: list[tuple[str, str]] = []
-    statsBoard = Board(Stats())
+    statsBoard = Board.fromFactory(Stats)
     stats = statsBoard[Square(0, 0)]
 
     # San and Lan castle
@@ -1004,55 +1122,93 @@ def getMovesCastle() -> resultType:
     return (moves, statsBoard)
 
 
+# Generate moves of every end square with specified function
+# End squares are distributed among worker processes if a process pool is running
+def getMovesAllSquares(getMovesSquare: Callable[[Square], tuple[list[tuple[str, str]], Stats]]) -> resultType:
+
+    moves: list[tuple[str, str]] = []
+    statsBoard = Board.fromFactory(Stats)
+
+    # Results are returned in order of end squares
+    if PROCESS_POOL:
+        results = PROCESS_POOL.map(getMovesSquare, SQUARES)
+    else:
+        results = map(getMovesSquare, SQUARES)
+
+    # Collect moves and statistics
+    for (endSquare, (movesSquare, stats)) in zip(SQUARES, results):
+        moves.extend(movesSquare)
+        statsBoard[endSquare] = stats
+
+    return (moves, statsBoard)
+
+
 ##########################
 ### Generate SAN moves ###
 ##########################
 
 # Get all SAN moves of one end square for a piece with disambiguation moves
-def getMovesDisambiguation(piece: str, endSquare: Square, startSquares: list[Square], stats: Stats
+def getMovesDisambiguation(piece: str, endSquare: Square, startSquares: tuple[Square, ...], stats: Stats
     ) -> list[tuple[str, str]]:
 
     movesSquare: list[tuple[str, str]] = []
-    endSquareStr = str(endSquare)
+    endSquareStr = SQUARE_NAMES[endSquare.index]
 
     # Move groups for plain, file, rank, and square moves
     moveGroupPlain = getEmptyMoveGroup()
     moveGroupFile = [getEmptyMoveGroup() for _ in range(8)]
     moveGroupRank = [getEmptyMoveGroup() for _ in range(8)]
-    moveGroupSquare = Board(getEmptyMoveGroup())
+    moveGroupSquare = Board.fromFactory(getEmptyMoveGroup)
 
     # One piece
     for startSquare in startSquares:
-        # Plain move
-        updateMoveGroup(moveGroupPlain, piece, startSquare, endSquare, [])
+        # Plain move (first chessboard found for every slot)
+        moveGroupSingle = getMoveGroupSingle(piece, startSquare, endSquare)
+        for (slotsPlain, slotsSingle) in zip(moveGroupPlain, moveGroupSingle):
+            for i in range(3):
+                slotsPlain[i] = slotsPlain[i] or slotsSingle[i]
 
     # Two pieces
-    for (startSquare, otherSquare) in permutations(startSquares, 2):
+    for startSquare in startSquares:
+        (file, rank, directionId) = (startSquare.file, startSquare.rank, startSquare.directionId)
 
-        # Pieces block each other's path
-        if startSquare.directionId == otherSquare.directionId:
-            continue
+        for otherSquare in startSquares:
 
-        # Rank move
-        if startSquare.file == otherSquare.file:
-            updateMoveGroup(moveGroupRank[startSquare.rank], piece, startSquare, endSquare, [otherSquare])
-        # File move
-        else:
-            updateMoveGroup(moveGroupFile[startSquare.file], piece, startSquare, endSquare, [otherSquare])
+            # Pieces block each other's path (also true for start square itself)
+            if directionId == otherSquare.directionId:
+                continue
+
+            # Rank move
+            if file == otherSquare.file:
+                updateMoveGroup(moveGroupRank[rank], piece, startSquare, endSquare, [otherSquare])
+            # File move
+            else:
+                updateMoveGroup(moveGroupFile[file], piece, startSquare, endSquare, [otherSquare])
+
+    # Start squares on every file and rank (in order of start squares)
+    startSquaresFile: list[list[Square]] = [[] for _ in range(8)]
+    startSquaresRank: list[list[Square]] = [[] for _ in range(8)]
+    for startSquare in startSquares:
+        startSquaresFile[startSquare.file].append(startSquare)
+        startSquaresRank[startSquare.rank].append(startSquare)
 
     # Three pieces
-    for (startSquare, otherSquare1, otherSquare2) in permutations(startSquares, 3):
+    # Both file and rank are needed for disambiguation if one other piece is on the same file and one on the same rank
+    for startSquare in startSquares:
+        for otherSquare1 in startSquaresFile[startSquare.file]:
+            if otherSquare1 == startSquare:
+                continue
 
-        # Check whether both file and rank are needed for disambiguation
-        if not (startSquare.file == otherSquare1.file and startSquare.rank == otherSquare2.rank):
-            continue
+            for otherSquare2 in startSquaresRank[startSquare.rank]:
+                if otherSquare2 == startSquare:
+                    continue
 
-        # Pieces block each other's path
-        if len({startSquare.directionId, otherSquare1.directionId, otherSquare2.directionId}) < 3:
-            continue
+                # Pieces block each other's path
+                if len({startSquare.directionId, otherSquare1.directionId, otherSquare2.directionId}) < 3:
+                    continue
 
-        # Square move
-        updateMoveGroup(moveGroupSquare[startSquare], piece, startSquare, endSquare, [otherSquare1, otherSquare2])
+                # Square move
+                updateMoveGroup(moveGroupSquare[startSquare], piece, startSquare, endSquare, [otherSquare1, otherSquare2])
 
     # Insert plain move
     if insertMoves(movesSquare, piece, endSquareStr, moveGroupPlain, stats):
@@ -1060,7 +1216,7 @@ def getMovesDisambiguation(piece: str, endSquare: Square, startSquares: list[Squ
 
     # Insert file moves
     for fileStart in range(8):
-        moveStart = piece + fileToStr(fileStart)
+        moveStart = piece + FILE_NAMES[fileStart]
         moveGroup = moveGroupFile[fileStart]
 
         if insertMoves(movesSquare, moveStart, endSquareStr, moveGroup, stats):
@@ -1068,7 +1224,7 @@ def getMovesDisambiguation(piece: str, endSquare: Square, startSquares: list[Squ
 
     # Insert rank moves
     for rankStart in range(8):
-        moveStart = piece + rankToStr(rankStart)
+        moveStart = piece + RANK_NAMES[rankStart]
         moveGroup = moveGroupRank[rankStart]
 
         if insertMoves(movesSquare, moveStart, endSquareStr, moveGroup, stats):
@@ -1076,163 +1232,158 @@ def getMovesDisambiguation(piece: str, endSquare: Square, startSquares: list[Squ
 
     # Insert square moves
     for startSquare in SQUARES:
-        moveStart = piece + str(startSquare)
+        moveStart = piece + SQUARE_NAMES[startSquare.index]
         moveGroup = moveGroupSquare[startSquare]
 
         if insertMoves(movesSquare, moveStart, endSquareStr, moveGroup, stats):
-            stats.squareMove[startSquare] = True
+            stats.squareMove[startSquare.index] = True
 
     # Mark reachable squares
     for startSquare in startSquares:
-        stats.reachable[startSquare] = True
+        stats.reachable[startSquare.index] = True
 
     return movesSquare
 
-# Get all SAN moves of a piece
-def getMovesPieceSan(piece: str, movement: list[Offset], isJump: bool) -> resultType:
+# Get all SAN moves of one end square for a piece
+def getMovesSquarePieceSan(piece: str, movement: tuple[Offset, ...], endSquare: Square
+    ) -> tuple[list[tuple[str, str]], Stats]:
 
-    moves: list[tuple[str, str]] = []
-    statsBoard = Board(Stats())
+    stats = Stats()
 
-    # For every end square
-    for endSquare in SQUARES:
+    # Get start squares
+    startSquares = START_SQUARES[movement][endSquare.index]
 
-        # Get start squares
-        if isJump:
-            startSquares = getStartSquaresJump(endSquare, movement)
-        elif piece:
-            startSquares = getStartSquaresDirection(endSquare, movement)
+    # Generate moves
+    return (getMovesDisambiguation(piece, endSquare, startSquares, stats), stats)
 
-        # Generate moves and append to move list
-        moves += getMovesDisambiguation(piece, endSquare, startSquares, statsBoard[endSquare])
+# Get all SAN moves of a piece
+def getMovesPieceSan(piece: str, movement: tuple[Offset, ...]) -> resultType:
+    return getMovesAllSquares(partial(getMovesSquarePieceSan, piece, movement))
 
-    return (moves, statsBoard)
-
-# Get all pawn SAN moves
-def getMovesPawnSan() -> resultType:
+# Get all pawn SAN moves of one end square
+def getMovesSquarePawnSan(endSquare: Square) -> tuple[list[tuple[str, str]], Stats]:
 
     moves: list[tuple[str, str]] = []
-    statsBoard = Board(Stats())
+    stats = Stats()
 
-    # For every end square
-    for endSquare in SQUARES:
-        stats = statsBoard[endSquare]
+    # White pawn can't reach first two ranks
+    player = "w" if endSquare.rank >= 2 else "b"
 
-        # White pawn can't reach first two ranks
-        player = "w" if endSquare.rank >= 2 else "b"
+    # Generate moves
+    moves.extend(getMovesPawnSingle(endSquare, player, stats, True))
+    moves.extend(getMovesPawnCapture(endSquare, player, stats, True))
 
-        # Generate moves
-        moves += getMovesPawnSingle(endSquare, player, stats, True)
-        moves += getMovesPawnCapture(endSquare, player, stats, True)
+    return (moves, stats)
 
-    return (moves, statsBoard)
+# Get all pawn SAN moves
+def getMovesPawnSan() -> resultType:
+    return getMovesAllSquares(getMovesSquarePawnSan)
 
-# Get all king SAN moves
-def getMovesKingSan() -> resultType:
+# Get all king SAN moves of one end square
+def getMovesSquareKingSan(endSquare: Square) -> tuple[list[tuple[str, str]], Stats]:
 
     moves: list[tuple[str, str]] = []
-    statsBoard = Board(Stats())
+    stats = Stats()
+    moveGroup = getEmptyMoveGroup()
 
-    # For every end square
-    for endSquare in SQUARES:
-        moveGroup = getEmptyMoveGroup()
+    # For every adjacent square as start square
+    for startSquare in START_SQUARES[KING_JUMPS][endSquare.index]:
 
-        # For every adjacent square as start square
-        for startSquare in getStartSquaresJump(endSquare, KING_JUMPS):
+        # Update move group
+        updateMoveGroup(moveGroup, "K", startSquare, endSquare, [])
 
-            # Update move group
-            updateMoveGroup(moveGroup, "K", startSquare, endSquare, [])
+    # Insert moves into move list
+    insertMoves(moves, "K", str(endSquare), moveGroup, stats)
 
-        # Insert moves into move list
-        insertMoves(moves, "K", str(endSquare), moveGroup, statsBoard[startSquare])
+    return (moves, stats)
 
-    return (moves, statsBoard)
+# Get all king SAN moves
+def getMovesKingSan() -> resultType:
+    return getMovesAllSquares(getMovesSquareKingSan)
 
 # Get all rook SAN moves
 def getMovesRookSan() -> resultType:
-    return getMovesPieceSan("R", ROOK_DIRECTIONS, False)
+    return getMovesPieceSan("R", ROOK_DIRECTIONS)
 
 # Get all bishop SAN moves
 def getMovesBishopSan() -> resultType:
-    return getMovesPieceSan("B", BISHOP_DIRECTIONS, False)
+    return getMovesPieceSan("B", BISHOP_DIRECTIONS)
 
 # Get all queen SAN moves
 def getMovesQueenSan() -> resultType:
-    return getMovesPieceSan("Q", QUEEN_DIRECTIONS, False)
+    return getMovesPieceSan("Q", QUEEN_DIRECTIONS)
 
 # Get all knight SAN moves
 def getMovesKnightSan() -> resultType:
-    return getMovesPieceSan("N", KNIGHT_JUMPS, True)
+    return getMovesPieceSan("N", KNIGHT_JUMPS)
 
 
 ##########################
 ### Generate LAN moves ###
 ##########################
 
-# Get all LAN moves of a piece
-def getMovesPieceLan(piece: str, movement: list[Offset], isJump: bool) -> resultType:
+# Get all LAN moves of one end square for a piece
+def getMovesSquarePieceLan(piece: str, movement: tuple[Offset, ...], endSquare: Square
+    ) -> tuple[list[tuple[str, str]], Stats]:
 
     moves: list[tuple[str, str]] = []
-    statsBoard = Board(Stats())
+    stats = Stats()
 
-    # For every end square
-    for endSquare in SQUARES:
+    # Get start squares
+    startSquares = START_SQUARES[movement][endSquare.index]
 
-        # Get start squares
-        if isJump:
-            startSquares = getStartSquaresJump(endSquare, movement)
-        elif piece:
-            startSquares = getStartSquaresDirection(endSquare, movement)
+    # For every start square
+    for startSquare in startSquares:
 
-        # For every start square
-        for startSquare in startSquares:
+        # Generate moves and append to move list
+        moveGroup = getMoveGroupSingle(piece, startSquare, endSquare)
+        insertMoves(moves, piece + SQUARE_NAMES[startSquare.index], SQUARE_NAMES[endSquare.index], moveGroup, stats)
 
-            # Generate moves and append to move list
-            moveGroup = getEmptyMoveGroup()
-            updateMoveGroup(moveGroup, piece, startSquare, endSquare, [])
-            insertMoves(moves, piece + str(startSquare), str(endSquare), moveGroup, statsBoard[endSquare])
+    return (moves, stats)
 
-    return (moves, statsBoard)
+# Get all LAN moves of a piece
+def getMovesPieceLan(piece: str, movement: tuple[Offset, ...]) -> resultType:
+    return getMovesAllSquares(partial(getMovesSquarePieceLan, piece, movement))
 
-# Get all pawn LAN moves
-def getMovesPawnLan() -> resultType:
+# Get all pawn LAN moves of one end square
+def getMovesSquarePawnLan(endSquare: Square) -> tuple[list[tuple[str, str]], Stats]:
 
     moves: list[tuple[str, str]] = []
-    statsBoard = Board(Stats())
+    stats = Stats()
 
-    # For every end square
-    for endSquare in SQUARES:
-        stats = statsBoard[endSquare]
+    # For both players
+    for player in ["w", "b"]:
 
-        # For both players
-        for player in ["w", "b"]:
+        # Generate moves
+        moves.extend(getMovesPawnSingle(endSquare, player, stats, False))
+        moves.extend(getMovesPawnCapture(endSquare, player, stats, False))
+        moves.extend(getMovesPawnDouble(endSquare, player, stats))
 
-            # Generate moves
-            moves += getMovesPawnSingle(endSquare, player, stats, False)
-            moves += getMovesPawnCapture(endSquare, player, stats, False)
-            moves += getMovesPawnDouble(endSquare, player, stats)
+    return (moves, stats)
 
-    return (moves, statsBoard)
+# Get all pawn LAN moves
+def getMovesPawnLan() -> resultType:
+    return getMovesAllSquares(getMovesSquarePawnLan)
 
 # Get all king LAN moves
 def getMovesKingLan() -> resultType:
-    return getMovesPieceLan("K", KING_JUMPS, True)
+    return getMovesPieceLan("K", KING_JUMPS)
 
 # Get all rook LAN moves
 def getMovesRookLan() -> resultType:
-    return getMovesPieceLan("R", ROOK_DIRECTIONS, False)
+    return getMovesPieceLan("R", ROOK_DIRECTIONS)
 
 # Get all bishop LAN moves
 def getMovesBishopLan() -> resultType:
-    return getMovesPieceLan("B", BISHOP_DIRECTIONS, False)
+    return getMovesPieceLan("B", BISHOP_DIRECTIONS)
 
 # Get all queen LAN moves
 def getMovesQueenLan() -> resultType:
-    return getMovesPieceLan("Q", QUEEN_DIRECTIONS, False)
+    return getMovesPieceLan("Q", QUEEN_DIRECTIONS)
 
 # Get all knight LAN moves
 def getMovesKnightLan() -> resultType:
-    return getMovesPieceLan("N", KNIGHT_JUMPS, True)
+    return getMovesPieceLan("N", KNIGHT_JUMPS)
 
 
 ####################
@@ -1251,8 +1402,7 @@ def readManualMoves() -> None:
                 continue
 
             # Extract move and FEN
-            line = line.rstrip()
-            lineSplit = re.split(" +", line, 1)
+            lineSplit = line.rstrip().split(None, 1)
 
             if len(lineSplit) != 2:
                 continue
@@ -1278,6 +1428,7 @@ def readManualMoves() -> None:
                 moveFlippedStart = piece + flipFileRank(disambiguation, flipFiles, flipRanks)
                 moveFlippedEnd = flipFileRank(endSquareStr, flipFiles, flipRanks) + rest
                 moveFlipped = moveFlippedStart + capture + moveFlippedEnd
+                MANUAL_MOVE_STARTS.add(moveFlippedStart)
 
                 # Generate flipped FEN
                 fenFlipped = chessboardToFen(chessboard, flipFiles, flipRanks, flipRanks and pawnMove)
@@ -1315,8 +1466,8 @@ def getDisambiguationTable(statsBoard: Board[Stats]) -> PrettyTable:
             counts = [
                 sum(stats.fileMove),
                 sum(stats.rankMove),
-                sum(stats.squareMove[square] for square in SQUARES),
-                sum(stats.reachable[square] for square in SQUARES)
+                sum(stats.squareMove),
+                sum(stats.reachable)
             ]
 
             # Append row
@@ -1343,10 +1494,10 @@ def outputStatistics(results: dict[str, resultType], filePath: str, isSan: bool)
 
             # Accumulate final symbol counts for all squares
             finalSymbolPiece = [0] * 3
-            for square in SQUARES:
+            for stats in statsBoard.board:
                 for i in range(3):
-                    finalSymbolTotal[i] += statsBoard[square].finalSymbol[i]
-                    finalSymbolPiece[i] += statsBoard[square].finalSymbol[i]
+                    finalSymbolTotal[i] += stats.finalSymbol[i]
+                    finalSymbolPiece[i] += stats.finalSymbol[i]
 
             # Output move counts for piece
             fileStats.write(f"{piece} : {len(moves)} ({'/'.join(map(str, finalSymbolPiece))})\n\n")
@@ -1366,20 +1517,14 @@ def outputStatistics(results: dict[str, resultType], filePath: str, isSan: bool)
             for key in ["checkmate", "check", "both"]:
 
                 fileStats.write(f"Missing {key}:\n")
-                noneMissing = True
 
                 # Only consider files [a-d] and ranks [1-4]
                 # Rest of chessboard is analogous because of flips
-                for file in range(4):
-                    for rank in range(4):
-                        for (move, fen) in statsBoard[Square(file, rank)].missingMoves[key]:
+                lines = [f"{move:6} {fen}\n" for file in range(4) for rank in range(4)
+                    for (move, fen) in statsBoard[Square(file, rank)].missingMoves[key]]
 
-                            # Output move and FEN
-                            fileStats.write(f"{move:6} {fen}\n")
-                            noneMissing = False
-
-                if noneMissing:
-                    fileStats.write("-\n")
+                # Output moves and FENs
+                fileStats.write("".join(lines) if lines else "-\n")
                 fileStats.write("\n")
 
             fileStats.write("\n")
@@ -1397,111 +1542,131 @@ def outputMoves(results: dict[str, resultType], filePath: str, isSan: bool) -> N
 
         # For every piece
         for (moves, _) in results.values():
-            # For every move
-            for move in moves:
+            # Write all moves at once (FEN might be unavailable)
+            fileMoves.write("".join([f"{move:{width}} {fen}\n" if fen else f"{move}\n" for (move, fen) in moves]))
 
-                # FEN available
-                if move[1]:
-                    fileMoves.write(f"{move[0]:{width}} {move[1]}\n")
-                # FEN unavailable
-                else:
-                    fileMoves.write(f"{move[0]}\n")
+# Get width of text written in font
+# Results are cached since only file and rank names are measured
+@lru_cache(maxsize=None)
+def getTextWidth(text: str) -> int:
+    return FONT.getsize(text)[0]
 
-# Generate an image of a chessboard
-# Mark files, ranks, and squares according to statistics
-def generateDisambiguationImage(endSquare: Square, stats: Stats, filePath: str) -> None:
+# Draw box around chessboard
+def drawBox(draw: ImageDraw.ImageDraw) -> None:
+    a = BORDER_SIZE
+    b = BORDER_SIZE + 8 * SIDE_LENGTH
+    draw.rectangle((a, a, b, b), outline="black", width=5)
+
+# Generate an image of an empty chessboard with file and rank names
+# The image is built once and copied for every end square
+@lru_cache(maxsize=None)
+def getBaseImage() -> Image.Image:
 
     image = Image.new("RGB", (2 * BORDER_SIZE + 8 * SIDE_LENGTH, 2 * BORDER_SIZE + 8 * SIDE_LENGTH), "white")
     draw = ImageDraw.Draw(image)
 
     # Draw squares
     for square in SQUARES:
-
-        # End square
-        if square == endSquare:
-            colorSquare = COLOR_END_SQUARE
-        # Other square
-        else:
-            colorSquare = COLOR_LIGHT if (square.file + square.rank) % 2 else COLOR_DARK
-
-        # Draw rectangle
+        colorSquare = COLOR_LIGHT if (square.file + square.rank) % 2 else COLOR_DARK
         x: float = BORDER_SIZE + square.file       * SIDE_LENGTH
         y: float = BORDER_SIZE + (7 - square.rank) * SIDE_LENGTH
         draw.rectangle((x, y, x + SIDE_LENGTH, y + SIDE_LENGTH), fill=colorSquare)
 
+    # Draw file names
+    for file in range(8):
+        fileStr = FILE_NAMES[file]
+        x = BORDER_SIZE + (file + 0.5) * SIDE_LENGTH - 0.5 * getTextWidth(fileStr)
+        draw.text((x, 30), fileStr, "black", FONT)
+
+    # Draw rank names
+    for rank in range(8):
+        rankStr = RANK_NAMES[rank]
+        y = BORDER_SIZE + (7 - rank) * SIDE_LENGTH + 55
+        draw.text((0.5 * BORDER_SIZE - 0.5 * getTextWidth(rankStr), y), rankStr, "black", FONT)
+
+    drawBox(draw)
+
+    return image
+
+# Generate an image of a chessboard
+# Mark files, ranks, and squares according to statistics
+def generateDisambiguationImage(endSquare: Square, stats: Stats, filePath: str) -> None:
+
+    image = getBaseImage().copy()
+    draw = ImageDraw.Draw(image)
+
+    # Draw end square
+    # Its top row and right column belong to the squares drawn after it on the base image
+    x: float = BORDER_SIZE + endSquare.file       * SIDE_LENGTH
+    y: float = BORDER_SIZE + (7 - endSquare.rank) * SIDE_LENGTH
+    draw.rectangle((x, y + 1, x + SIDE_LENGTH - 1, y + SIDE_LENGTH), fill=COLOR_END_SQUARE)
+
+    # Draw square circles
+    for square in SQUARES:
+
         # Square move
-        if stats.squareMove[square]:
+        if stats.squareMove[square.index]:
             colorCircle = COLOR_MARKED
         # Reachable square
-        elif stats.reachable[square]:
+        elif stats.reachable[square.index]:
             colorCircle = COLOR_REACHABLE
         # Other square
         else:
-            colorCircle = None
+            continue
 
         # Draw circle
-        if colorCircle:
-            x += 0.5 * SIDE_LENGTH
-            y += 0.5 * SIDE_LENGTH
-            xy = (x - CIRCLE_RADIUS, y - CIRCLE_RADIUS, x + CIRCLE_RADIUS, y + CIRCLE_RADIUS)
-            draw.ellipse(xy, colorCircle)
+        x = BORDER_SIZE + (square.file       + 0.5) * SIDE_LENGTH
+        y = BORDER_SIZE + (7 - square.rank + 0.5) * SIDE_LENGTH
+        xy = (x - CIRCLE_RADIUS, y - CIRCLE_RADIUS, x + CIRCLE_RADIUS, y + CIRCLE_RADIUS)
+        draw.ellipse(xy, colorCircle)
 
-    # Draw file names
+    # Draw file circles
     for file in range(8):
-
-        # Draw file name
-        fileStr = chr(ord("a") + file)
-        w, _ = FONT.getsize(fileStr)
-        x = BORDER_SIZE + (file + 0.5) * SIDE_LENGTH - 0.5 * w
-        y = 30
-        draw.text((x, y), fileStr, "black", FONT)
-
-        # Draw circle
         if stats.fileMove[file]:
             x = BORDER_SIZE + (file + 0.5) * SIDE_LENGTH
             y = 0.5 * BORDER_SIZE
             xy = (x - CIRCLE_RADIUS, y - CIRCLE_RADIUS, x + CIRCLE_RADIUS, y + CIRCLE_RADIUS)
             draw.ellipse(xy, outline=COLOR_MARKED, width=10)
 
-    # Draw rank names
+    # Draw rank circles
     for rank in range(8):
-
-        # Draw rank name
-        rankStr = str(rank + 1)
-        w, _ = FONT.getsize(rankStr)
-        x = 0.5 * BORDER_SIZE - 0.5 * w
-        y = BORDER_SIZE + (7 - rank) * SIDE_LENGTH + 55
-        draw.text((x, y), rankStr, "black", FONT)
-
-        # Draw circle
         if stats.rankMove[rank]:
             x = 0.5 * BORDER_SIZE
             y = BORDER_SIZE + (7 - rank + 0.5) * SIDE_LENGTH
             xy = (x - CIRCLE_RADIUS, y - CIRCLE_RADIUS, x + CIRCLE_RADIUS, y + CIRCLE_RADIUS)
             draw.ellipse(xy, outline=COLOR_MARKED, width=10)
 
-    # Draw box around chessboard
-    a = BORDER_SIZE
-    b = BORDER_SIZE + 8 * SIDE_LENGTH
-    draw.rectangle((a, a, b, b), outline="black", width=5)
+    # Redraw box over end square on the edge
+    drawBox(draw)
 
     # Save image
     image.save(filePath)
 
 # Output disambiguation images for every piece with disambiguation moves and every square
+# Images are generated in threads since Pillow releases the GIL while encoding PNGs
 def outputDisambiguationImages(results: dict[str, resultType]) -> None:
 
-    # For every piece with disambiguation moves
-    for piece in ["Rook", "Bishop", "Queen", "Knight"]:
-        statsBoard = results[piece][1]
+    # Build base image before threads copy it
+    getBaseImage()
+
+    with ThreadPoolExecutor() as executor:
+        futures = []
+
+        # For every piece with disambiguation moves
+        for piece in ["Rook", "Bishop", "Queen", "Knight"]:
+            statsBoard = results[piece][1]
+
+            # For every end square
+            for endSquare in SQUARES:
 
-        # For every end square
-        for endSquare in SQUARES:
+                # Generate image as save to file
+                fileName = f"{piece.lower()}-{str(endSquare)}.png"
+                filePath = f"{IMAGES_FOLDER}/{piece}/{fileName}"
+                futures.append(executor.submit(generateDisambiguationImage, endSquare, statsBoard[endSquare], filePath))
 
-            # Generate image as save to file
-            fileName = f"{piece.lower()}-{str(endSquare)}.png"
-            filePath = f"{IMAGES_FOLDER}/{piece}/{fileName}"
-            generateDisambiguationImage(endSquare, statsBoard[endSquare], filePath)
+        # Raise errors of image generation
+        for future in futures:
+            future.result()
 
 
 ############
@@ -1516,50 +1681,68 @@ def main() -> None:
     parser.add_argument("--no-san", action="store_true", help="don't generate SAN moves")
     parser.add_argument("--no-lan", action="store_true", help="don't generate LAN moves")
     parser.add_argument("--images", action="store_true", help="output disambiguation images")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1,
+        help="number of worker processes for move generation (default: number of CPUs)")
     arguments = parser.parse_args()
 
     san = not arguments.no_san
     lan = not arguments.no_lan
     images = arguments.images
+    processes = arguments.processes
 
     # Read manual moves from file
     readManualMoves()
 
-    # SAN moves
-    if san:
+    # Start worker processes, which read manual moves on their own
+    global PROCESS_POOL
+    if processes > 1:
+        PROCESS_POOL = ProcessPoolExecutor(processes, initializer=readManualMoves)
 
-        # Generate moves
-        resultsSan = {
-            "Pawn"   : getMovesPawnSan(),
-            "King"   : getMovesKingSan(),
-            "Rook"   : getMovesRookSan(),
-            "Bishop" : getMovesBishopSan(),
-            "Queen"  : getMovesQueenSan(),
-            "Knight" : getMovesKnightSan(),
-            "Castle" : getMovesCastle()
-        }
-
-        # Output
-        outputMoves(resultsSan, MOVES_SAN_PATH, True)
-        outputStatistics(resultsSan, STATS_SAN_PATH, True)
-
-    # LAN moves
-    if lan:
+    # Generate and output moves
+    # Worker processes are stopped even if this fails
+    try:
 
-        # Generate moves
-        resultsLan = {
-            "Pawn"   : getMovesPawnLan(),
-            "King"   : getMovesKingLan(),
-            "Rook"   : getMovesRookLan(),
-            "Bishop" : getMovesBishopLan(),
-            "Queen"  : getMovesQueenLan(),
-            "Knight" : getMovesKnightLan(),
-            "Castle" : getMovesCastle()
-        }
-
-        # Output
-        outputMoves(resultsLan, MOVES_LAN_PATH, False)
-        outputStatistics(resultsLan, STATS_LAN_PATH, False)
+        # SAN moves
+        if san:
+
+            # Generate moves
+            resultsSan = {
+                "Pawn"   : getMovesPawnSan(),
+                "King"   : getMovesKingSan(),
+                "Rook"   : getMovesRookSan(),
+                "Bishop" : getMovesBishopSan(),
+                "Queen"  : getMovesQueenSan(),
+                "Knight" : getMovesKnightSan(),
+                "Castle" : getMovesCastle()
+            }
+
+            # Output
+            outputMoves(resultsSan, MOVES_SAN_PATH, True)
+            outputStatistics(resultsSan, STATS_SAN_PATH, True)
+
+        # LAN moves
+        if lan:
+
+            # Generate moves
+            resultsLan = {
+                "Pawn"   : getMovesPawnLan(),
+                "King"   : getMovesKingLan(),
+                "Rook"   : getMovesRookLan(),
+                "Bishop" : getMovesBishopLan(),
+                "Queen"  : getMovesQueenLan(),
+                "Knight" : getMovesKnightLan(),
+                "Castle" : getMovesCastle()
+            }
+
+            # Output
+            outputMoves(resultsLan, MOVES_LAN_PATH, False)
+            outputStatistics(resultsLan, STATS_LAN_PATH, False)
+
+    finally:
+        # Stop worker processes
+        if PROCESS_POOL:
+            PROCESS_POOL.shutdown()
+            PROCESS_POOL = None
 
     # Output disambiguation images
     if images and san:
@@ -1,11 +1,64 @@
 import chess
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from typing import Optional, Tuple
 
 # Paths
 DIR_NAME      = os.path.dirname(__file__)
 MOVE_SAN_PATH = os.path.join(DIR_NAME, "../Data/moves-san.txt")
 MOVE_LAN_PATH = os.path.join(DIR_NAME, "../Data/moves-lan.txt")
 
+# Get board from FEN
+# Boards are cached since the same position is shared by several moves
+# Boards are not copied since parsing and validating moves leaves them unchanged
+@lru_cache(maxsize=None)
+def getBoard(fen: str) -> chess.Board:
+    return chess.Board(fen)
+
+# Check whether board of FEN is valid
+# Results are cached alongside boards so every position is only checked once
+@lru_cache(maxsize=None)
+def isValidFen(fen: str) -> bool:
+    return getBoard(fen).is_valid()
+
+# Validate a line consisting of a move and an optional FEN
+# Return stripped line, move, and result ("valid", "invalid", "noFen", or None for an overspecified SAN move)
+# Result is "error" if board or move can't be parsed
+def validateLine(line: str, isSan: bool) -> Tuple[str, str, Optional[str]]:
+
+    # Split line into move and FEN
+    line = line.rstrip()
+    parts = line.split(" ", 1)
+    moveStr = parts[0]
+
+    # No FEN
+    if len(parts) == 1:
+        return line, moveStr, "noFen"
+
+    # Try to get board and move object
+    fen = parts[1]
+    try:
+        board = getBoard(fen)
+        move = board.parse_san(moveStr)
+
+    # Invalid board or move
+    except ValueError:
+        return line, moveStr, "error"
+
+    # Invalid board
+    if not isValidFen(fen):
+        return line, moveStr, "invalid"
+
+    # In case of SAN, check whether move is not overspecified
+    if isSan and board.san(move) != moveStr:
+        return line, moveStr, None
+
+    return line, moveStr, "valid"
+
+# Validate all moves in file
+# Lines are validated in worker processes and their results are collected in order
 def validateMoves(filePath: str, isSan: bool, text: str) -> None:
 
     # Counters
@@ -16,45 +69,22 @@ def validateMoves(filePath: str, isSan: bool, text: str) -> None:
     moveSet    = set()
 
     # Read moves and their FENs from file
-    with open(filePath, "r") as f:
+    with open(filePath, "r") as f, ProcessPoolExecutor() as executor:
+        for (line, moveStr, result) in executor.map(validateLine, f, repeat(isSan), chunksize=1024):
 
-        for line in f.readlines():
-            line = line.rstrip()
-
-            # No FEN
-            pos = line.find(" ")
-            if pos == -1:
-                moveStr = line
+            if result == "valid":
+                valid += 1
+            elif result == "noFen":
                 noFen += 1
-
-            # FEN
-            else:
-
-                # Split line into move and FEN
-                moveStr = line[:pos]
-                fen = line[pos + 1:]
-
-                # Try to get board and move object
-                try:
-                    board = chess.Board(fen)
-                    move = board.parse_san(moveStr)
-
-                # Invalid board or move
-                except ValueError:
-                    invalid += 1
-                    print(f"Invalid {line}")
-                    continue
-
-                # Check whether board is valid                 
-                if board.is_valid(): 
-                    # In case of SAN, check whether move is not overspecified
-                    if not (isSan and board.san(move) != moveStr):
-                        valid += 1
-
-                # Invalid
-                else:
-                    invalid += 1
-                    print(f"Invalid {line}")
+            elif result == "invalid":
+                invalid += 1
+                print(f"Invalid {line}")
+
+            # Unparsable board or move isn't checked for duplicates
+            elif result == "error":
+                invalid += 1
+                print(f"Invalid {line}")
+                continue
 
             # Check for duplicate move
             if moveStr in moveSet:
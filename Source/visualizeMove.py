@@ -10,28 +10,27 @@ pngPath   = os.path.join(dirName, "../chessboard.png")
 width = 1000
 height = 1000
 
-# FEN dictionary
-moveToFen = {}
+# Get move from input
+moveStr = input("Move: ").strip()
 
-# Read moves and their FENs from file
+# Read moves and their FENs from file until move is found
+fen = None
 with open(movesPath, "r") as fileMoves:
 
-    for line in fileMoves.readlines():
-        line = line.rstrip()
+    for line in fileMoves:
 
         # Split line into move and FEN
-        pos = line.find(" ")
-        moveStr = line[:pos]
-        fen = line[pos + 1:]
+        lineMoveStr, _, lineFen = line.rstrip().partition(" ")
 
-        # Update FEN dictionary
-        moveToFen[moveStr] = fen
+        # Stop at move
+        if lineMoveStr == moveStr:
+            fen = lineFen
+            break
 
-# Get move from input
-moveStr = input("Move: ").strip()
+# Unknown move
+if fen is None:
+    raise SystemExit(f"Unknown move: {moveStr}")
 
-# Get FEN from dictionary
-fen = moveToFen[moveStr]
 board = chess.Board(fen)
 
 # Calculate arrow for move